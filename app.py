@@ -1,23 +1,168 @@
-from flask import Flask, render_template, request, jsonify ,redirect
+from flask import Flask, render_template, request, jsonify ,redirect, g, abort, has_request_context, url_for
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import default_exceptions
 import json
 import os
 import logging
 import re
 import time
 import hashlib
+import math
+import bisect
+import gzip
+import tempfile
+import threading
+import ipaddress
+from array import array
 from datetime import datetime
 from functools import wraps
+from collections import OrderedDict
 from dotenv import load_dotenv
+import click
 import google.generativeai as genai
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
+# ========== ABUSE DETECTION ==========
+class CountMinSketch:
+    """Fixed-memory frequency estimates with conservative update"""
+
+    def __init__(self, width=2**16, depth=4):
+        self.width = width
+        self.depth = depth
+        self.rows = [array('I', bytes(4 * width)) for _ in range(depth)]
+
+    def indexes(self, key):
+        # Double hashing: derive all row positions from one 64-bit hash
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, key, count=1, positions=None):
+        """Add count to key and return its new estimate"""
+        positions = positions or self.indexes(key)
+        estimate = min(row[i] for row, i in zip(self.rows, positions)) + count
+        for row, i in zip(self.rows, positions):
+            if row[i] < estimate:
+                row[i] = estimate
+        return estimate
+
+    def estimate(self, key, positions=None):
+        positions = positions or self.indexes(key)
+        return min(row[i] for row, i in zip(self.rows, positions))
+
+    def clear(self):
+        self.rows = [array('I', bytes(4 * self.width)) for _ in range(self.depth)]
+
+
+class AbuseDetector:
+    """Heavy-hitter detection per IP and subnet with escalating, expiring bans.
+
+    Request rates and validation failures are counted in two rotating
+    count-min sketches (sliding window approximation), so memory is fixed
+    no matter how many distinct addresses show up. Bans live in a dict
+    capped at ``max_bans`` entries, checked in O(1).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.window = int(os.getenv('ABUSE_WINDOW', 60))
+        self.ip_threshold = int(os.getenv('ABUSE_IP_THRESHOLD', 120))
+        self.subnet_threshold = int(os.getenv('ABUSE_SUBNET_THRESHOLD', 600))
+        self.failure_weight = int(os.getenv('ABUSE_FAILURE_WEIGHT', 15))
+        self.base_ban = int(os.getenv('ABUSE_BAN_SECONDS', 300))
+        self.max_ban = int(os.getenv('ABUSE_MAX_BAN_SECONDS', 86400))
+        self.max_bans = int(os.getenv('ABUSE_MAX_BANS', 10000))
+        width = int(os.getenv('ABUSE_SKETCH_WIDTH', 2**16))
+        self.current = CountMinSketch(width)
+        self.previous = CountMinSketch(width)
+        self.window_start = time.time()
+        # key -> (expires_at, strikes); expired entries are kept to remember strikes
+        self.bans = {}
+
+    @staticmethod
+    def subnet(ip):
+        """/24 for IPv4, /64 for IPv6"""
+        if ':' in ip:
+            try:
+                return str(ipaddress.ip_network(f"{ip}/64", strict=False))
+            except ValueError:
+                return ip
+        return ip.rsplit('.', 1)[0] + '.0/24'
+
+    def rotate(self, now):
+        elapsed = now - self.window_start
+        if elapsed < self.window:
+            return
+        self.previous, self.current = self.current, self.previous
+        self.current.clear()
+        if elapsed >= 2 * self.window:
+            self.previous.clear()
+        self.window_start = now
+
+    def count(self, key, weight, now):
+        """Add weight to key and return its sliding-window rate estimate"""
+        # Both sketches share a width, so positions are hashed once
+        positions = self.current.indexes(key)
+        overlap = 1 - (now - self.window_start) / self.window
+        return (self.current.add(key, weight, positions)
+                + self.previous.estimate(key, positions) * max(0.0, overlap))
+
+    def record(self, ip, weight=1, now=None):
+        """Count an event for ip (and its subnet); ban it if it becomes a heavy hitter"""
+        now = now or time.time()
+        subnet = self.subnet(ip)
+        with self.lock:
+            self.rotate(now)
+            if self.count(ip, weight, now) > self.ip_threshold:
+                self.ban(ip, now)
+            if self.count(subnet, weight, now) > self.subnet_threshold:
+                self.ban(subnet, now)
+
+    def ban(self, key, now):
+        expires, strikes = self.bans.pop(key, (0, 0))
+        if expires > now:
+            self.bans[key] = (expires, strikes)
+            return
+        if len(self.bans) >= self.max_bans:
+            self.evict(now)
+        duration = min(self.max_ban, self.base_ban * 2 ** strikes)
+        self.bans[key] = (now + duration, strikes + 1)
+        logging.warning(f"Auto-banned {key} for {duration}s (strike {strikes + 1})")
+
+    def evict(self, now):
+        """Drop expired bans; if all are active, drop the oldest one"""
+        expired = [key for key, (expires, _) in self.bans.items() if expires <= now]
+        for key in expired[:max(1, len(self.bans) // 4)]:
+            del self.bans[key]
+        if len(self.bans) >= self.max_bans:
+            del self.bans[next(iter(self.bans))]
+
+    def is_banned(self, ip, now=None):
+        now = now or time.time()
+        return (self.bans.get(ip, (0, 0))[0] > now
+                or self.bans.get(self.subnet(ip), (0, 0))[0] > now)
+
+    def active_bans(self):
+        now = time.time()
+        with self.lock:
+            return {key: {'expires_in': int(expires - now), 'strikes': strikes}
+                    for key, (expires, strikes) in self.bans.items() if expires > now}
+
 # ========== SECURITY MIDDLEWARE ==========
 class SecurityMiddleware:
     def __init__(self):
+        self.lock = threading.Lock()
         self.request_counts = {}
+        self.last_sweep = time.time()
         self.blocked_ips = set()
+        self.abuse = AbuseDetector()
         self.suspicious_patterns = [
             "ignore previous",
             "system:",
@@ -39,34 +184,56 @@ class SecurityMiddleware:
                 current_time = time.time()
                 
                 # Check if IP is blocked
-                if client_ip in self.blocked_ips:
+                if client_ip in self.blocked_ips or self.abuse.is_banned(client_ip):
                     logging.warning(f"Blocked IP attempted access: {client_ip}")
                     return jsonify({"error": "Access denied"}), 429
                 
-                # Initialize or clean old entries
-                if client_ip not in self.request_counts:
-                    self.request_counts[client_ip] = []
+                self.abuse.record(client_ip, now=current_time)
                 
-                # Remove old requests outside window
-                self.request_counts[client_ip] = [
-                    req_time for req_time in self.request_counts[client_ip]
-                    if current_time - req_time < window
-                ]
+                # Workers run several threads, so bookkeeping happens under the lock
+                with self.lock:
+                    # Forget idle IPs so memory tracks active clients, not every client ever seen
+                    if current_time - self.last_sweep > window:
+                        self.request_counts = {
+                            key: times for key, times in self.request_counts.items()
+                            if times and current_time - times[-1] < window
+                        }
+                        self.last_sweep = current_time
+                
+                    # Limits are per tenant so one busy portfolio can't use up another's
+                    key = (current_tenant_name(), client_ip)
+                
+                    # Initialize or clean old entries
+                    if key not in self.request_counts:
+                        self.request_counts[key] = []
+                
+                    # Remove old requests outside window
+                    self.request_counts[key] = [
+                        req_time for req_time in self.request_counts[key]
+                        if current_time - req_time < window
+                    ]
                 
-                # Check rate limit
-                if len(self.request_counts[client_ip]) >= max_requests:
-                    logging.warning(f"Rate limit exceeded for IP: {client_ip}")
-                    return jsonify({"error": "Rate limit exceeded. Please wait before sending more messages."}), 429
+                    # Check rate limit
+                    if len(self.request_counts[key]) >= max_requests:
+                        logging.warning(f"Rate limit exceeded for IP: {client_ip}")
+                        return jsonify({"error": "Rate limit exceeded. Please wait before sending more messages."}), 429
                 
-                # Add current request
-                self.request_counts[client_ip].append(current_time)
+                    # Add current request
+                    self.request_counts[key].append(current_time)
                 
                 return f(*args, **kwargs)
             return decorated_function
         return decorator
     
     def validate_input(self, message):
-        """Input validation and sanitization"""
+        """Input validation and sanitization; failures count towards abuse bans"""
+        try:
+            return self.check_input(message)
+        except ValueError:
+            self.abuse.record(request.remote_addr, self.abuse.failure_weight)
+            raise
+    
+    def check_input(self, message):
         if not message or not isinstance(message, str):
             raise ValueError("Invalid message format")
         
@@ -112,7 +279,211 @@ class SecurityMiddleware:
 # Initialize security middleware
 security = SecurityMiddleware()
 
+# ========== ADMISSION CONTROL ==========
+class AdmissionController:
+    """Load shedding for expensive routes, grouped by priority class.
+
+    Each class tracks its own in-flight count and an EWMA of service time.
+    Classes without limits (page routes) are only tracked, never shed, so
+    chat overload can't take the rest of the site down with it.
+
+    Degrading is driven by a separate EWMA of upstream latency, fed through
+    ``observe()`` only by requests that made the expensive call. Cheap
+    rejections and degraded local answers would otherwise drag it down
+    exactly while the route is flooded. While degraded, one request per
+    ``probe_interval`` still goes upstream to re-measure it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.target_latency = float(os.getenv('CHAT_TARGET_LATENCY_MS', 2000)) / 1000
+        self.trust_request_start = os.getenv('TRUST_REQUEST_START', '').lower() in ('1', 'true', 'yes')
+        self.probe_interval = float(os.getenv('CHAT_PROBE_SECONDS', 10))
+        # Limits are per worker process; with gunicorn's threaded workers, keeping
+        # chat below the thread count leaves threads free for page routes
+        threads = int(os.getenv('WEB_THREADS', 8))
+        self.classes = {
+            'page': {'max_in_flight': None},
+            'chat': {'max_in_flight': int(os.getenv('CHAT_MAX_IN_FLIGHT', max(1, threads // 2)))},
+        }
+        self.stats = {
+            name: {'in_flight': 0, 'latency': 0.0, 'upstream_latency': 0.0, 'last_upstream': 0.0,
+                   'admitted': 0, 'degraded': 0, 'shed': 0}
+            for name in self.classes
+        }
+
+    def queue_delay(self):
+        """Time spent queued before reaching us, from the proxy's X-Request-Start header.
+
+        Clients can send the header too, so it's only read when
+        TRUST_REQUEST_START says a proxy in front of us sets it.
+        """
+        if not self.trust_request_start:
+            return 0.0
+        header = request.headers.get('X-Request-Start', '')
+        try:
+            started = float(header[2:] if header.startswith('t=') else header)
+        except ValueError:
+            return 0.0
+        if not math.isfinite(started) or started <= 0:
+            return 0.0
+        # Proxies send seconds, milliseconds, microseconds or nanoseconds
+        if started > 1e17:
+            started /= 1e9
+        elif started > 1e14:
+            started /= 1e6
+        elif started > 1e11:
+            started /= 1e3
+        return max(0.0, time.time() - started)
+
+    def decide(self, priority, delay=0.0):
+        """Return 'admit', 'degrade' or 'shed' for a request of the given class"""
+        limits = self.classes[priority]
+        stats = self.stats[priority]
+        if limits['max_in_flight'] is None:
+            return 'admit'
+
+        if stats['in_flight'] >= limits['max_in_flight'] or delay > 2 * self.target_latency:
+            return 'shed'
+        if delay > self.target_latency:
+            return 'degrade'
+        if stats['upstream_latency'] > self.target_latency:
+            now = time.time()
+            if now - stats['last_upstream'] < self.probe_interval:
+                return 'degrade'
+            # Let this one through to see whether upstream has recovered
+            stats['last_upstream'] = now
+        return 'admit'
+
+    def observe(self, priority, elapsed):
+        """Record the time an admitted request spent on the expensive upstream call"""
+        with self.lock:
+            stats = self.stats[priority]
+            if stats['last_upstream']:
+                stats['upstream_latency'] = 0.8 * stats['upstream_latency'] + 0.2 * elapsed
+            else:
+                stats['upstream_latency'] = elapsed
+            stats['last_upstream'] = time.time()
+
+    def retry_after(self, priority):
+        """Seconds a shed client should wait, based on current upstream latency"""
+        stats = self.stats[priority]
+        return max(1, int(stats['upstream_latency'] * max(1, stats['in_flight']) + 0.5))
+
+    def admit(self, priority='page'):
+        """Admission control decorator"""
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                stats = self.stats[priority]
+                delay = self.queue_delay() if self.classes[priority]['max_in_flight'] else 0.0
+                with self.lock:
+                    decision = self.decide(priority, delay)
+                    if decision == 'shed':
+                        stats['shed'] += 1
+                    else:
+                        stats['in_flight'] += 1
+                        stats['admitted' if decision == 'admit' else 'degraded'] += 1
+
+                if decision == 'shed':
+                    logging.warning(f"Shedding {priority} request from IP: {request.remote_addr}")
+                    return (jsonify({"error": "Server is busy. Please try again shortly."}), 503,
+                            {'Retry-After': str(self.retry_after(priority))})
+
+                g.degraded = decision == 'degrade'
+                started = time.time()
+                try:
+                    return f(*args, **kwargs)
+                finally:
+                    elapsed = time.time() - started
+                    with self.lock:
+                        stats['in_flight'] -= 1
+                        stats['latency'] = 0.8 * stats['latency'] + 0.2 * elapsed
+            return decorated_function
+        return decorator
+
+# Initialize admission controller
+admission = AdmissionController()
+
+# ========== JSON RESPONSES ==========
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify backed by orjson when it's installed.
+
+    Values encode the same as with the default provider: datetimes and
+    other types orjson would format differently go through ``default``
+    (HTTP dates, not ISO 8601). Non-ASCII text is emitted as UTF-8 rather
+    than \\u escapes.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or set(kwargs) - {'separators', 'indent'} or kwargs.get('indent') not in (None, 2):
+            return super().dumps(obj, **kwargs)
+        
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+        except TypeError:
+            # orjson is stricter in places (e.g. integers over 64 bits), let the stdlib try
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+class JSONResponseCache:
+    """Serialize read-heavy JSON responses once per data version.
+
+    Each entry keeps the encoded body, a gzip variant for larger bodies and
+    an ETag, so unchanged data costs no serialization and conditional
+    requests get a bodyless 304.
+    """
+
+    def __init__(self, gzip_min_size=1024):
+        self.lock = threading.Lock()
+        self.gzip_min_size = gzip_min_size
+        self.entries = {}
+
+    def get(self, key, version, build):
+        """Return the cached entry for key, rebuilding it if version changed"""
+        entry = self.entries.get(key)
+        if entry is None or entry['version'] != version:
+            body = f"{app.json.dumps(build(), separators=(',', ':'))}\n".encode('utf-8')
+            etag = hashlib.sha256(body).hexdigest()[:32]
+            entry = {
+                'version': version,
+                'body': body,
+                'etag': etag,
+                'gzip': gzip.compress(body, 6) if len(body) >= self.gzip_min_size else None,
+            }
+            with self.lock:
+                self.entries[key] = entry
+        return entry
+
+    def response(self, key, version, build):
+        """Serve key from cache with ETag/304 and gzip negotiation"""
+        entry = self.get(key, version, build)
+        use_gzip = entry['gzip'] is not None and 'gzip' in request.accept_encodings
+        etag = entry['etag'] + ('-gz' if use_gzip else '')
+        
+        # Weak comparison, as clients and proxies may send W/"..." back
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+        elif use_gzip:
+            response = app.response_class(entry['gzip'], mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = app.response_class(entry['body'], mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+json_cache = JSONResponseCache()
 
 # ========== DATA VALIDATION ==========
 def validate_projects_data(projects):
@@ -120,31 +491,35 @@ def validate_projects_data(projects):
     if not isinstance(projects, list):
         raise ValueError("Projects data must be a list")
     
-    required_fields = ['title', 'description', 'technologies']
     for i, project in enumerate(projects):
-        if not isinstance(project, dict):
-            raise ValueError(f"Project {i} must be a dictionary")
-        
-        for field in required_fields:
-            if field not in project:
-                raise ValueError(f"Project {i} missing required field: {field}")
-        
-        # Validate specific field types
-        if not isinstance(project['title'], str) or not project['title'].strip():
-            raise ValueError(f"Project {i} title must be a non-empty string")
-        
-        if not isinstance(project['description'], str) or not project['description'].strip():
-            raise ValueError(f"Project {i} description must be a non-empty string")
-        
-        if not isinstance(project['technologies'], list):
-            raise ValueError(f"Project {i} technologies must be a list")
-        
-        # Optional fields validation
-        if 'github' in project and project['github'] and not isinstance(project['github'], str):
-            raise ValueError(f"Project {i} github must be a string")
-        
-        if 'demo' in project and project['demo'] and not isinstance(project['demo'], str):
-            raise ValueError(f"Project {i} demo must be a string")
+        validate_project(project, i)
+
+def validate_project(project, i):
+    """Validate a single project entry"""
+    required_fields = ['title', 'description', 'technologies']
+    if not isinstance(project, dict):
+        raise ValueError(f"Project {i} must be a dictionary")
+    
+    for field in required_fields:
+        if field not in project:
+            raise ValueError(f"Project {i} missing required field: {field}")
+    
+    # Validate specific field types
+    if not isinstance(project['title'], str) or not project['title'].strip():
+        raise ValueError(f"Project {i} title must be a non-empty string")
+    
+    if not isinstance(project['description'], str) or not project['description'].strip():
+        raise ValueError(f"Project {i} description must be a non-empty string")
+    
+    if not isinstance(project['technologies'], list):
+        raise ValueError(f"Project {i} technologies must be a list")
+    
+    # Optional fields validation
+    if 'github' in project and project['github'] and not isinstance(project['github'], str):
+        raise ValueError(f"Project {i} github must be a string")
+    
+    if 'demo' in project and project['demo'] and not isinstance(project['demo'], str):
+        raise ValueError(f"Project {i} demo must be a string")
 
 def validate_skills_data(skills_data):
     """Validate skills.json structure"""
@@ -159,109 +534,652 @@ def validate_skills_data(skills_data):
         raise ValueError("Skills must be a list")
     
     for i, category in enumerate(skills):
-        if not isinstance(category, dict):
-            raise ValueError(f"Skills category {i} must be a dictionary")
-        
-        if 'category' not in category:
-            raise ValueError(f"Skills category {i} missing 'category' field")
+        validate_skill_category(category, i)
+
+def validate_skill_category(category, i):
+    """Validate a single skills category and its items"""
+    if not isinstance(category, dict):
+        raise ValueError(f"Skills category {i} must be a dictionary")
+    
+    if 'category' not in category:
+        raise ValueError(f"Skills category {i} missing 'category' field")
+    
+    if 'items' not in category:
+        raise ValueError(f"Skills category {i} missing 'items' field")
+    
+    if not isinstance(category['items'], list):
+        raise ValueError(f"Skills category {i} items must be a list")
+    
+    for j, item in enumerate(category['items']):
+        if not isinstance(item, dict):
+            raise ValueError(f"Skills category {i} item {j} must be a dictionary")
         
-        if 'items' not in category:
-            raise ValueError(f"Skills category {i} missing 'items' field")
+        if 'name' not in item or 'proficiency' not in item:
+            raise ValueError(f"Skills category {i} item {j} missing required fields")
         
-        if not isinstance(category['items'], list):
-            raise ValueError(f"Skills category {i} items must be a list")
+        if not isinstance(item['name'], str) or not item['name'].strip():
+            raise ValueError(f"Skills category {i} item {j} name must be a non-empty string")
         
-        for j, item in enumerate(category['items']):
-            if not isinstance(item, dict):
-                raise ValueError(f"Skills category {i} item {j} must be a dictionary")
-            
-            if 'name' not in item or 'proficiency' not in item:
-                raise ValueError(f"Skills category {i} item {j} missing required fields")
-            
-            if not isinstance(item['name'], str) or not item['name'].strip():
-                raise ValueError(f"Skills category {i} item {j} name must be a non-empty string")
-            
-            if not isinstance(item['proficiency'], int) or not (1 <= item['proficiency'] <= 5):
-                raise ValueError(f"Skills category {i} item {j} proficiency must be an integer between 1 and 5")
+        if not isinstance(item['proficiency'], int) or not (1 <= item['proficiency'] <= 5):
+            raise ValueError(f"Skills category {i} item {j} proficiency must be an integer between 1 and 5")
 
 def validate_timeline_data(timeline_data):
     """Validate timeline.json structure"""
     if not isinstance(timeline_data, list):
         raise ValueError("Timeline data must be a list")
     
-    required_fields = ['year', 'title', 'description']
     for i, event in enumerate(timeline_data):
-        if not isinstance(event, dict):
-            raise ValueError(f"Timeline event {i} must be a dictionary")
-        
-        for field in required_fields:
-            if field not in event:
-                raise ValueError(f"Timeline event {i} missing required field: {field}")
-        
-        if not isinstance(event['title'], str) or not event['title'].strip():
-            raise ValueError(f"Timeline event {i} title must be a non-empty string")
-        
-        if not isinstance(event['description'], str) or not event['description'].strip():
-            raise ValueError(f"Timeline event {i} description must be a non-empty string")
-        
-        # Year can be string or number
-        if not isinstance(event['year'], (str, int)):
-            raise ValueError(f"Timeline event {i} year must be a string or number")
+        validate_timeline_event(event, i)
+
+def validate_timeline_event(event, i):
+    """Validate a single timeline event"""
+    required_fields = ['year', 'title', 'description']
+    if not isinstance(event, dict):
+        raise ValueError(f"Timeline event {i} must be a dictionary")
+    
+    for field in required_fields:
+        if field not in event:
+            raise ValueError(f"Timeline event {i} missing required field: {field}")
+    
+    if not isinstance(event['title'], str) or not event['title'].strip():
+        raise ValueError(f"Timeline event {i} title must be a non-empty string")
+    
+    if not isinstance(event['description'], str) or not event['description'].strip():
+        raise ValueError(f"Timeline event {i} description must be a non-empty string")
+    
+    # Year can be string or number
+    if not isinstance(event['year'], (str, int)):
+        raise ValueError(f"Timeline event {i} year must be a string or number")
+    
+    # Optional fields validation
+    if 'event_type' in event and event['event_type'] and not isinstance(event['event_type'], str):
+        raise ValueError(f"Timeline event {i} event_type must be a string")
+    
+    if 'icon' in event and event['icon'] and not isinstance(event['icon'], str):
+        raise ValueError(f"Timeline event {i} icon must be a string")
+    
+    if 'link' in event and event['link'] and not isinstance(event['link'], str):
+        raise ValueError(f"Timeline event {i} link must be a string")
+
+def validate_profile(profile):
+    """Validate profile.json structure (every field is optional)"""
+    if not isinstance(profile, dict):
+        raise ValueError("Profile must be a dictionary")
+    
+    for field in ('name', 'short_name', 'handle', 'email'):
+        if field in profile and not isinstance(profile[field], str):
+            raise ValueError(f"Profile {field} must be a string")
+    
+    for field in ('name', 'short_name', 'handle'):
+        if field in profile and not profile[field].strip():
+            raise ValueError(f"Profile {field} must be a non-empty string")
+    
+    pronouns = profile.get('pronouns', {})
+    if not isinstance(pronouns, dict) or not all(isinstance(pronouns.get(k, ''), str) for k in ('object', 'possessive')):
+        raise ValueError("Profile pronouns must be a dictionary with 'object' and 'possessive' strings")
+    
+    links = profile.get('links', {})
+    if not isinstance(links, dict):
+        raise ValueError("Profile links must be a dictionary")
+    for name, url in links.items():
+        if not isinstance(url, str) or not url.startswith(('https://', 'http://')):
+            raise ValueError(f"Profile link '{name}' must be an http(s) URL")
+    
+    if not isinstance(profile.get('about', []), list) or not all(isinstance(p, str) for p in profile.get('about', [])):
+        raise ValueError("Profile about must be a list of strings")
+    
+    facts = profile.get('facts', [])
+    if not isinstance(facts, list):
+        raise ValueError("Profile facts must be a list")
+    for i, fact in enumerate(facts):
+        if not isinstance(fact, dict) or not isinstance(fact.get('key'), str) or not isinstance(fact.get('value'), str):
+            raise ValueError(f"Profile fact {i} must have 'key' and 'value' strings")
+
+# ========== DATA STORAGE ==========
+def atomic_write_json(path, data):
+    """Write JSON via temp file + fsync + rename so readers never see a partial file"""
+    raw = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    # Persist the rename itself
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+    return raw
+
+def apply_patch(entries, ops, validate_entry):
+    """Apply JSON-Patch-style add/replace/remove ops to a list of entries.
+
+    Paths address one entry: "/3", or "/-" to append. Only added or
+    replaced entries are validated. Returns a new list, leaving entries
+    untouched if any op fails.
+    """
+    if isinstance(ops, dict):
+        ops = [ops]
+    if not isinstance(ops, list) or not ops:
+        raise ValueError("Patch must be an operation or a non-empty list of operations")
+    
+    entries = list(entries)
+    for op in ops:
+        if not isinstance(op, dict) or op.get('op') not in ('add', 'replace', 'remove'):
+            raise ValueError("Each operation needs an 'op' of add, replace or remove")
         
-        # Optional fields validation
-        if 'event_type' in event and event['event_type'] and not isinstance(event['event_type'], str):
-            raise ValueError(f"Timeline event {i} event_type must be a string")
+        path = op.get('path', '')
+        if not isinstance(path, str) or not path.startswith('/'):
+            raise ValueError(f"Invalid path: {path}")
         
-        if 'icon' in event and event['icon'] and not isinstance(event['icon'], str):
-            raise ValueError(f"Timeline event {i} icon must be a string")
+        if path == '/-' and op['op'] == 'add':
+            index = len(entries)
+        else:
+            try:
+                index = int(path[1:])
+            except ValueError:
+                raise ValueError(f"Invalid path: {path}")
+            limit = len(entries) if op['op'] == 'add' else len(entries) - 1
+            if not 0 <= index <= limit:
+                raise ValueError(f"Path out of range: {path}")
+        
+        if op['op'] == 'remove':
+            del entries[index]
+            continue
+        
+        if 'value' not in op:
+            raise ValueError(f"Operation {op['op']} {path} missing 'value'")
+        validate_entry(op['value'], index)
+        if op['op'] == 'add':
+            entries.insert(index, op['value'])
+        else:
+            entries[index] = op['value']
+    return entries
+
+class JournaledDataFile:
+    """A JSON data file with an append-only journal of patches.
+
+    Patches are fsynced to ``<file>.journal`` instead of rewriting the whole
+    file; the journal is folded back into the file every ``compact_every``
+    patches. Journal lines carry a hash of the base file they apply to, so
+    lines left over from a crash during compaction are skipped on replay.
+    """
+
+    def __init__(self, path, key=None):
+        self.path = path
+        self.journal_path = path + '.journal'
+        self.key = key  # Entries live under this key (skills.json), else the file is the list
+        self.lock = threading.Lock()
+        self.compact_every = int(os.getenv('DATA_JOURNAL_COMPACT_EVERY', 50))
+        self.base_hash = None
+        self.pending = 0
+        self.size = 0  # Bytes of base file plus live journal lines
+
+    def load(self):
+        """Read the base file and replay any journaled patches.
+
+        Call with ``self.lock`` held. State is only updated once everything
+        parsed, so a broken base file leaves ``base_hash`` unset and PATCH
+        refuses to journal against it.
+        """
+        self.base_hash = None
+        self.pending = 0
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        base_hash = hashlib.sha256(raw).hexdigest()
+        size = len(raw)
+        pending = 0
+        data = json.loads(raw.decode('utf-8'))
+        
+        if not os.path.exists(self.journal_path):
+            self.base_hash, self.size, self.pending = base_hash, size, pending
+            return data
         
-        if 'link' in event and event['link'] and not isinstance(event['link'], str):
-            raise ValueError(f"Timeline event {i} link must be a string")
+        try:
+            entries = data[self.key] if self.key else data
+            with open(self.journal_path, 'r+b') as f:
+                good = 0
+                for line in f:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError("unterminated line")
+                        record = json.loads(line.decode('utf-8'))
+                    except ValueError:
+                        # A write torn by a crash; cut it off so new appends start clean
+                        logging.warning(f"Truncating torn journal line in {self.journal_path}")
+                        f.truncate(good)
+                        break
+                    good += len(line)
+                    if record.get('base') != base_hash:
+                        continue
+                    entries = apply_patch(entries, record['ops'], lambda value, index: None)
+                    pending += 1
+                    size += len(line)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Cannot replay journal {self.journal_path}: {e}")
+        
+        if self.key:
+            data = dict(data, **{self.key: entries})
+        else:
+            data = entries
+        self.base_hash, self.size, self.pending = base_hash, size, pending
+        return data
+
+    def patch(self, ops, validate_entry, current, commit):
+        """Apply ops to current(), journal them and hand the result to commit().
+
+        Both callbacks run under the file lock, so concurrent patches each
+        build on the previous one and memory never falls behind the journal.
+        """
+        with self.lock:
+            if self.base_hash is None and os.path.exists(self.path):
+                # Patches against a file that didn't load would be skipped on the next replay
+                raise ValueError(f"{os.path.basename(self.path)} failed to load; replace the whole file instead")
+            new_entries = apply_patch(current(), ops, validate_entry)
+            if self.base_hash is None:
+                # No base file yet, start one instead of journaling against nothing
+                self.compact(new_entries)
+                commit(new_entries)
+                return new_entries
+            line = json.dumps({'base': self.base_hash, 'ops': ops}, ensure_ascii=False) + '\n'
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.pending += 1
+            self.size += len(line.encode('utf-8'))
+            if self.pending >= self.compact_every:
+                self.compact(new_entries)
+            commit(new_entries)
+            return new_entries
+
+    def replace(self, data, commit):
+        """Atomically replace the whole file, discarding the journal, then commit()"""
+        with self.lock:
+            self.write_base(data)
+            commit()
+
+    def compact(self, entries):
+        """Fold journaled patches into the base file"""
+        self.write_base({self.key: entries} if self.key else entries)
+        logging.info(f"Compacted journal for {self.path}")
+
+    def write_base(self, data):
+        raw = atomic_write_json(self.path, data)
+        self.base_hash = hashlib.sha256(raw).hexdigest()
+        self.size = len(raw)
+        # Old journal lines no longer match base_hash, truncating is just cleanup
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.pending = 0
+
+# ========== TIMELINE INDEX ==========
+def year_key(year):
+    """Sortable key for a timeline year, which may be an int or a string like "2021-2023" or "Present" """
+    if isinstance(year, int):
+        return year
+    match = re.search(r'\d{4}', year)
+    if match:
+        return int(match.group())
+    if year.strip().lower() in ('present', 'now', 'current'):
+        return 9999
+    return 0
+
+class TimelineIndex:
+    """Timeline events pre-sorted by normalized year, bisectable by year and event type"""
+
+    def __init__(self, events):
+        # sorted() is stable, so events sharing a year keep their file order
+        keyed = sorted(((year_key(event['year']), event) for event in events), key=lambda pair: pair[0])
+        self.keys = [key for key, _ in keyed]
+        self.events = [event for _, event in keyed]
+        self.newest_first = self.events[::-1]
+        self.by_type = {}
+        for key, event in keyed:
+            keys, typed_events = self.by_type.setdefault(event.get('event_type') or '', ([], []))
+            keys.append(key)
+            typed_events.append(event)
+
+    def query(self, start=None, end=None, event_type=None, limit=None):
+        """Events with start <= year <= end (inclusive), oldest first"""
+        if event_type is None:
+            keys, events = self.keys, self.events
+        else:
+            keys, events = self.by_type.get(event_type, ([], []))
+        lo = 0 if start is None else bisect.bisect_left(keys, start)
+        hi = len(keys) if end is None else bisect.bisect_right(keys, end)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return events[lo:hi]
+
+# ========== PORTFOLIO DATA ==========
+# Identity of the single-site portfolio; tenants override it with profile.json
+DEFAULT_PROFILE = {
+    'name': 'Guu Tran',
+    'short_name': 'Guu',
+    'handle': 'guu',
+    'pronouns': {'object': 'him', 'possessive': 'his'},
+    'email': '',
+    'links': {
+        'github': 'https://github.com/yourusername',
+        'linkedin': 'https://linkedin.com/in/yourusername',
+        'twitter': 'https://twitter.com/yourusername',
+        'facebook': 'https://facebook.com/yourusername',
+        'blog': 'https://guutran.wordpress.com',
+    },
+    'about': [
+        "AI Engineer with expertise in computer vision, NLP, and speech processing.",
+        "I am passionate about leveraging AI to solve real-world problems. My work focuses on developing innovative solutions in computer vision, natural language processing, and speech recognition.",
+        "With a strong background in Python, TensorFlow, and PyTorch, I have built several projects that demonstrate my skills in these domains.",
+        "Outside of work, I enjoy exploring new technologies, reading about advancements in AI, and contributing to open-source projects.",
+        "Feel free to connect with me on my social media platforms!",
+    ],
+    'facts': [
+        {'key': 'job', 'value': 'Intern AI Engineer at Opus Solution'},
+        {'key': 'hobbies', 'value': 'exploring AI, open-source, reading, audiobook story, and learning new things'},
+        {'key': 'project', 'value': 'real-time image processing, speech recognition, and chatbot'},
+    ],
+}
+
+def fallback_profile(name):
+    """DEFAULT_PROFILE for the single site; tenants don't inherit it, so a
+    tenant without profile.json is shown under its own name with no links"""
+    if name == 'default':
+        return DEFAULT_PROFILE
+    return {
+        'name': name, 'short_name': name, 'handle': name.split('.')[0],
+        'pronouns': {'object': 'them', 'possessive': 'their'},
+        'email': '', 'links': {}, 'about': [], 'facts': [],
+    }
+
+class PortfolioData:
+    """One portfolio's validated data plus everything derived from it.
+
+    The timeline index, cached JSON bodies and chatbot context all hang off
+    this object, so evicting a tenant in multi-tenant mode frees them together.
+    """
+
+    validators = {
+        'projects': (validate_projects_data, validate_project),
+        'skills': (validate_skills_data, validate_skill_category),
+        'timeline': (validate_timeline_data, validate_timeline_event),
+    }
+    attributes = {'projects': 'projects', 'skills': 'skills', 'timeline': 'timeline_data', 'profile': 'profile'}
+
+    def __init__(self, data_dir='static/data', name='default'):
+        self.name = name
+        self.files = {
+            'projects': JournaledDataFile(os.path.join(data_dir, 'projects.json')),
+            'skills': JournaledDataFile(os.path.join(data_dir, 'skills.json'), key='skills'),
+            'timeline': JournaledDataFile(os.path.join(data_dir, 'timeline.json')),
+        }
+        # Bumped whenever a dataset is replaced; keys cached responses and context
+        self.versions = {'projects': 0, 'skills': 0, 'timeline': 0, 'profile': 0}
+        self.profile_path = os.path.join(data_dir, 'profile.json')
+        self.profile = self.default_profile()
+        self.projects = []
+        self.skills = []
+        self.timeline_data = []
+        self.timeline_index = TimelineIndex([])
+        self.json_cache = JSONResponseCache()
+        self.derived = {}
+        self.last_used = time.time()
+        # Called after every data swap; the tenant registry uses it to track size
+        self.on_change = None
+
+    def load(self):
+        """Load and validate all JSON data files"""
+        for name in self.files:
+            self.load_dataset(name)
+        self.load_profile()
+
+    def default_profile(self):
+        """Profile used where profile.json is missing or leaves a field out"""
+        return fallback_profile(self.name)
+
+    def load_profile(self):
+        """Load the optional profile.json (name, pronouns, links, about text)"""
+        profile = self.default_profile()
+        try:
+            with open(self.profile_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            validate_profile(data)
+            profile = dict(profile, **data)
+            profile['pronouns'] = dict(self.default_profile()['pronouns'], **data.get('pronouns', {}))
+            logging.info(f"Profile loaded and validated successfully ({self.name})")
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, ValueError) as e:
+            logging.error(f"Error loading profile.json for {self.name}: {e}")
+        self.set('profile', profile)
+
+    def load_dataset(self, name):
+        """Load, validate and swap in one dataset.
+
+        The file lock is held from read to swap-in, so a PATCH can't land in
+        between and then vanish from memory.
+        """
+        data_file = self.files[name]
+        filename = os.path.basename(data_file.path)
+        with data_file.lock:
+            try:
+                data = data_file.load()
+                self.validators[name][0](data)
+                entries = data.get('skills', []) if name == 'skills' else data
+                logging.info(f"{name.capitalize()} data loaded and validated successfully ({self.name})")
+            except FileNotFoundError:
+                entries = []
+                logging.warning(f"{filename} not found for {self.name}, using empty list")
+            except (json.JSONDecodeError, ValueError) as e:
+                logging.error(f"Error loading {filename} for {self.name}: {e}")
+                # Memory now holds an empty list, not the file; PATCH must not build on it
+                data_file.base_hash = None
+                data_file.pending = 0
+                entries = []
+            self.set(name, entries)
+
+    def set(self, name, entries):
+        """Swap in new entries for a dataset"""
+        setattr(self, self.attributes[name], entries)
+        if name == 'timeline':
+            self.timeline_index = TimelineIndex(entries)
+        # Bump after the data is swapped in so caches never pin old data to a new version
+        self.versions[name] += 1
+        if self.on_change:
+            self.on_change(self)
+
+    def replace(self, name, data):
+        """Validate a whole file's worth of data and atomically save it"""
+        self.validators[name][0](data)
+        self.files[name].replace(data, lambda: self.set(name, data['skills'] if name == 'skills' else data))
+
+    def patch(self, name, ops):
+        """Apply JSON-Patch-style ops, validating only the touched entries"""
+        self.files[name].patch(ops, self.validators[name][1],
+                               lambda: getattr(self, self.attributes[name]),
+                               lambda entries: self.set(name, entries))
+
+    def cached(self, key, build):
+        """Memoize a value derived from the data until any dataset changes"""
+        version = tuple(self.versions.values())
+        entry = self.derived.get(key)
+        if entry is None or entry[0] != version:
+            entry = (version, build())
+            self.derived[key] = entry
+        return entry[1]
+
+    def compact(self):
+        """Fold any journaled patches into the base files"""
+        for name, data_file in self.files.items():
+            with data_file.lock:
+                if data_file.pending and data_file.base_hash:
+                    data_file.compact(getattr(self, self.attributes[name]))
+
+    def fingerprint(self, *names):
+        """Content hash of the given datasets (all of them by default)"""
+        names = names or tuple(self.versions)
+        def build():
+            digest = hashlib.sha256()
+            for name in names:
+                entries = getattr(self, self.attributes[name])
+                digest.update(json.dumps(entries, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+            return digest.hexdigest()
+        return self.cached('fingerprint:' + ','.join(names), build)
+
+    @property
+    def size(self):
+        """Approximate weight: bytes of JSON loaded"""
+        return sum(data_file.size for data_file in self.files.values())
+
+
+class TenantRegistry:
+    """Lazily loaded tenant portfolios in an LRU capped by count and size.
+
+    Tenants live in ``TENANTS_DIR/<name>/`` with the same JSON files as
+    static/data. They load on first request and are evicted when idle for
+    ``TENANT_IDLE_SECONDS`` or when the caps are exceeded.
+    """
+
+    name_pattern = re.compile(r'^[a-z0-9][a-z0-9.-]{0,62}$')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.root = os.getenv('TENANTS_DIR', 'tenants')
+        self.max_tenants = int(os.getenv('TENANT_CACHE_MAX', 1000))
+        self.max_bytes = int(os.getenv('TENANT_CACHE_MAX_MB', 256)) * 1024 * 1024
+        self.idle_timeout = int(os.getenv('TENANT_IDLE_SECONDS', 900))
+        self.tenants = OrderedDict()
+        # name -> size last added to the running total, so it stays consistent
+        self.weights = {}
+        self.total_size = 0
+
+    def get(self, name):
+        """Return the tenant's portfolio, loading it on first use; None if unknown"""
+        now = time.time()
+        with self.lock:
+            portfolio = self.tenants.get(name)
+            if portfolio is not None:
+                self.tenants.move_to_end(name)
+                portfolio.last_used = now
+                self.evict(now)
+                return portfolio
+        
+        if not self.name_pattern.match(name) or not os.path.isdir(os.path.join(self.root, name)):
+            return None
+        
+        # Load outside the lock so a cold tenant doesn't stall the warm ones
+        portfolio = PortfolioData(os.path.join(self.root, name), name)
+        portfolio.load()
+        with self.lock:
+            if name in self.tenants:
+                return self.tenants[name]
+            self.tenants[name] = portfolio
+            self.weights[name] = portfolio.size
+            self.total_size += portfolio.size
+            portfolio.on_change = self.resize
+            self.evict(now)
+        logging.info(f"Loaded tenant {name} ({portfolio.size} bytes, {len(self.tenants)} loaded)")
+        return portfolio
+
+    def resize(self, portfolio):
+        """Re-weigh a loaded tenant after its data was replaced, patched or reloaded"""
+        with self.lock:
+            if self.tenants.get(portfolio.name) is not portfolio:
+                return
+            size = portfolio.size
+            self.total_size += size - self.weights[portfolio.name]
+            self.weights[portfolio.name] = size
+            self.evict(time.time())
+
+    def evict(self, now):
+        """Drop idle tenants, then least recently used ones while over the caps"""
+        while len(self.tenants) > 1:
+            name, oldest = next(iter(self.tenants.items()))
+            over_cap = len(self.tenants) > self.max_tenants or self.total_size > self.max_bytes
+            if not over_cap and now - oldest.last_used < self.idle_timeout:
+                break
+            del self.tenants[name]
+            self.total_size -= self.weights.pop(name)
+            oldest.on_change = None
+
+    def stats(self):
+        with self.lock:
+            return {
+                'loaded': len(self.tenants),
+                'total_bytes': self.total_size,
+                'max_tenants': self.max_tenants,
+                'max_bytes': self.max_bytes,
+            }
+
+
+class TenantPathMiddleware:
+    """Move the leading /<tenant> path segment into SCRIPT_NAME.
+
+    Routes then match as usual and url_for/request.script_root produce
+    tenant-prefixed URLs.
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        tenant, _, rest = environ.get('PATH_INFO', '').lstrip('/').partition('/')
+        environ['portfolio.tenant'] = tenant.lower()
+        environ['SCRIPT_NAME'] = environ.get('SCRIPT_NAME', '') + '/' + tenant
+        environ['PATH_INFO'] = '/' + rest
+        return self.wsgi_app(environ, start_response)
+
+# '' (single portfolio from static/data), 'host' or 'path'
+MULTI_TENANT = os.getenv('MULTI_TENANT', '').lower()
+
+default_portfolio = PortfolioData()
+tenants = TenantRegistry()
+
+if MULTI_TENANT == 'path':
+    app.wsgi_app = TenantPathMiddleware(app.wsgi_app)
+
+def current_tenant_name():
+    """Tenant selected by the current request's host or path prefix"""
+    if not MULTI_TENANT or not has_request_context():
+        return default_portfolio.name
+    if MULTI_TENANT == 'path':
+        return request.environ.get('portfolio.tenant', '')
+    return request.host.split(':')[0].lower()
+
+def current_portfolio():
+    """Portfolio for the current request"""
+    if not MULTI_TENANT or not has_request_context():
+        return default_portfolio
+    if 'portfolio' not in g:
+        portfolio = tenants.get(current_tenant_name())
+        if portfolio is None:
+            abort(404)
+        g.portfolio = portfolio
+    return g.portfolio
+
+@app.before_request
+def resolve_tenant():
+    # Unknown tenants get a 404 before any route runs
+    if MULTI_TENANT and request.endpoint != 'static':
+        current_portfolio()
+
+@app.context_processor
+def inject_profile():
+    # An unknown tenant's 404 has no portfolio, so it mustn't show anyone's identity
+    if MULTI_TENANT and 'portfolio' not in g:
+        return {'profile': fallback_profile('Portfolio')}
+    return {'profile': current_portfolio().profile}
 
 def load_and_validate_data():
     """Load and validate all JSON data files"""
-    global projects, skills, timeline_data
-    
-    # Load and validate projects
-    try:
-        with open('static/data/projects.json', 'r', encoding='utf-8') as f:
-            projects_data = json.load(f)
-        validate_projects_data(projects_data)
-        projects = projects_data
-        logging.info("Projects data loaded and validated successfully")
-    except FileNotFoundError:
-        projects = []
-        logging.warning("projects.json not found, using empty list")
-    except (json.JSONDecodeError, ValueError) as e:
-        logging.error(f"Error loading projects.json: {e}")
-        projects = []
-    
-    # Load and validate skills
-    try:
-        with open('static/data/skills.json', 'r', encoding='utf-8') as f:
-            skills_data = json.load(f)
-        validate_skills_data(skills_data)
-        skills = skills_data.get('skills', [])
-        logging.info("Skills data loaded and validated successfully")
-    except FileNotFoundError:
-        skills = []
-        logging.warning("skills.json not found, using empty list")
-    except (json.JSONDecodeError, ValueError) as e:
-        logging.error(f"Error loading skills.json: {e}")
-        skills = []
-    
-    # Load and validate timeline
-    try:
-        with open('static/data/timeline.json', 'r', encoding='utf-8') as f:
-            timeline_data = json.load(f)
-        validate_timeline_data(timeline_data)
-        logging.info("Timeline data loaded and validated successfully")
-    except FileNotFoundError:
-        timeline_data = []
-        logging.warning("timeline.json not found, using empty list")
-    except (json.JSONDecodeError, ValueError) as e:
-        logging.error(f"Error loading timeline.json: {e}")
-        timeline_data = []
+    current_portfolio().load()
 
 # Initialize data
 load_and_validate_data()
@@ -297,35 +1215,122 @@ def bad_request(error):
                          status=400), 400
 
 
+# ========== CLIENT CACHING ==========
+PAGE_ENDPOINTS = ('home', 'timeline_page', 'projects_page', 'skills_page')
+static_hashes = {}
+
+def static_file_hash(filename):
+    """Short content hash of a static file, recomputed when its mtime changes"""
+    path = os.path.join(app.static_folder, filename)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = static_hashes.get(filename)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'rb') as f:
+            cached = (mtime, hashlib.sha256(f.read()).hexdigest()[:12])
+        static_hashes[filename] = cached
+    return cached[1]
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint, values):
+    # url_for('static', ...) gets ?v=<hash>, so assets can be cached forever
+    if endpoint == 'static' and 'filename' in values and 'v' not in values:
+        file_hash = static_file_hash(values['filename'])
+        if file_hash:
+            values['v'] = file_hash
+
+def data_version():
+    """Short version of the current portfolio's data, for client-side cache invalidation"""
+    return current_portfolio().fingerprint()[:16]
+
+def shell_urls():
+    """Fingerprinted assets the service worker precaches"""
+    return [url_for('static', filename='css/style.css'), url_for('static', filename='js/script.js')]
+
+def page_urls():
+    """Pages the service worker precaches; they hold data, so they're cached by data version"""
+    root = request.script_root
+    return [root + '/', root + '/timeline', root + '/projects', root + '/skills']
+
+@app.after_request
+def add_cache_headers(response):
+    if request.endpoint == 'static' and 'v' in request.args:
+        response.cache_control.no_cache = False
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    elif request.endpoint in PAGE_ENDPOINTS + ('chat',) and response.status_code == 200:
+        response.headers['X-Data-Version'] = data_version()
+    return response
+
+@app.route('/sw.js')
+def service_worker():
+    """Service worker, served from the root so its scope covers the whole site"""
+    urls = shell_urls()
+    body = render_template('sw.js', shell_urls=urls, page_urls=page_urls(),
+                           shell_version=hashlib.sha256('\n'.join(urls).encode()).hexdigest()[:12])
+    response = app.response_class(body, mimetype='application/javascript')
+    response.cache_control.no_cache = True
+    return response
+
+
 @app.route('/')
+@admission.admit('page')
 def home():
-    return render_template('pages/home.html', skills=skills)
+    return render_template('pages/home.html', skills=current_portfolio().skills)
 
 @app.route('/timeline')
+@admission.admit('page')
 def timeline_page():
-    return render_template('pages/timeline.html', timeline=timeline_data)
+    return render_template('pages/timeline.html', timeline=current_portfolio().timeline_index.events)
 
 @app.route('/projects')
+@admission.admit('page')
 def projects_page():
-    return render_template('pages/projects.html', projects=projects)
+    return render_template('pages/projects.html', projects=current_portfolio().projects)
 
 @app.route('/skills')
+@admission.admit('page')
 def skills_page():
     # print("Skills data:", skills)  # Debug: In giá trị của skills
     # print("Type of skills:", type(skills))  # Debug: Kiểm tra kiểu của skills
     # for category in skills:
     #     print("Category:", category)
     #     print("Type of category.items:", type(category.get('items')))
-    return render_template('pages/skills.html', skills=skills)
+    return render_template('pages/skills.html', skills=current_portfolio().skills)
 
 @app.route('/blog')
 def blog_page():
-    return redirect("https://guutran.wordpress.com", code=302)
+    blog = current_portfolio().profile['links'].get('blog')
+    if not blog:
+        abort(404)
+    return redirect(blog, code=302)
 
 @app.route('/project/<project_id>')
 def project_detail(project_id):
     return jsonify({"id": project_id, "message": "Project detail endpoint, to be implemented"})
 
+@app.route('/api/timeline')
+def timeline_api():
+    """Timeline events by year range and event type"""
+    params = {}
+    for name in ('from', 'to', 'limit'):
+        value = request.args.get(name)
+        if value is None:
+            continue
+        try:
+            params[name] = int(value)
+        except ValueError:
+            return jsonify({"error": f"{name} must be an integer"}), 400
+    if params.get('limit', 0) < 0:
+        return jsonify({"error": "limit must not be negative"}), 400
+    
+    events = current_portfolio().timeline_index.query(params.get('from'), params.get('to'),
+                                  request.args.get('type'), params.get('limit'))
+    return jsonify({"events": events, "count": len(events)})
+
 # ========== ADMIN ENDPOINTS ==========
 @app.route('/admin/reload-data')
 def reload_data():
@@ -336,11 +1341,13 @@ def reload_data():
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
-@app.route('/admin/data/projects', methods=['GET', 'POST'])
+@app.route('/admin/data/projects', methods=['GET', 'POST', 'PATCH'])
 def admin_projects():
     """Admin endpoint to view/edit projects data"""
+    portfolio = current_portfolio()
     if request.method == 'GET':
-        return jsonify(projects)
+        return portfolio.json_cache.response('admin:projects', portfolio.versions['projects'],
+                                             lambda: portfolio.projects)
     
     elif request.method == 'POST':
         try:
@@ -348,15 +1355,24 @@ def admin_projects():
             if not new_data:
                 return jsonify({"status": "error", "message": "No data provided"}), 400
             
-            # Validate the new data
-            validate_projects_data(new_data)
+            # Validate the new data and save to file atomically
+            portfolio.replace('projects', new_data)
             
-            # Save to file
-            with open('static/data/projects.json', 'w', encoding='utf-8') as f:
-                json.dump(new_data, f, indent=2, ensure_ascii=False)
+            return jsonify({"status": "success", "message": "Projects updated successfully"})
+        
+        except ValueError as e:
+            return jsonify({"status": "error", "message": f"Validation error: {str(e)}"}), 400
+        except Exception as e:
+            return jsonify({"status": "error", "message": f"Error updating projects: {str(e)}"}), 500
+    
+    elif request.method == 'PATCH':
+        try:
+            ops = request.get_json()
+            if not ops:
+                return jsonify({"status": "error", "message": "No data provided"}), 400
             
-            # Reload data
-            load_and_validate_data()
+            # Validate only the touched entries and journal the patch
+            portfolio.patch('projects', ops)
             
             return jsonify({"status": "success", "message": "Projects updated successfully"})
         
@@ -365,11 +1381,13 @@ def admin_projects():
         except Exception as e:
             return jsonify({"status": "error", "message": f"Error updating projects: {str(e)}"}), 500
 
-@app.route('/admin/data/skills', methods=['GET', 'POST'])
+@app.route('/admin/data/skills', methods=['GET', 'POST', 'PATCH'])
 def admin_skills():
     """Admin endpoint to view/edit skills data"""
+    portfolio = current_portfolio()
     if request.method == 'GET':
-        return jsonify({"skills": skills})
+        return portfolio.json_cache.response('admin:skills', portfolio.versions['skills'],
+                                             lambda: {"skills": portfolio.skills})
     
     elif request.method == 'POST':
         try:
@@ -377,15 +1395,24 @@ def admin_skills():
             if not new_data:
                 return jsonify({"status": "error", "message": "No data provided"}), 400
             
-            # Validate the new data
-            validate_skills_data(new_data)
+            # Validate the new data and save to file atomically
+            portfolio.replace('skills', new_data)
             
-            # Save to file
-            with open('static/data/skills.json', 'w', encoding='utf-8') as f:
-                json.dump(new_data, f, indent=2, ensure_ascii=False)
+            return jsonify({"status": "success", "message": "Skills updated successfully"})
+        
+        except ValueError as e:
+            return jsonify({"status": "error", "message": f"Validation error: {str(e)}"}), 400
+        except Exception as e:
+            return jsonify({"status": "error", "message": f"Error updating skills: {str(e)}"}), 500
+    
+    elif request.method == 'PATCH':
+        try:
+            ops = request.get_json()
+            if not ops:
+                return jsonify({"status": "error", "message": "No data provided"}), 400
             
-            # Reload data
-            load_and_validate_data()
+            # Validate only the touched entries and journal the patch
+            portfolio.patch('skills', ops)
             
             return jsonify({"status": "success", "message": "Skills updated successfully"})
         
@@ -394,11 +1421,13 @@ def admin_skills():
         except Exception as e:
             return jsonify({"status": "error", "message": f"Error updating skills: {str(e)}"}), 500
 
-@app.route('/admin/data/timeline', methods=['GET', 'POST'])
+@app.route('/admin/data/timeline', methods=['GET', 'POST', 'PATCH'])
 def admin_timeline():
     """Admin endpoint to view/edit timeline data"""
+    portfolio = current_portfolio()
     if request.method == 'GET':
-        return jsonify(timeline_data)
+        return portfolio.json_cache.response('admin:timeline', portfolio.versions['timeline'],
+                                             lambda: portfolio.timeline_data)
     
     elif request.method == 'POST':
         try:
@@ -406,15 +1435,24 @@ def admin_timeline():
             if not new_data:
                 return jsonify({"status": "error", "message": "No data provided"}), 400
             
-            # Validate the new data
-            validate_timeline_data(new_data)
+            # Validate the new data and save to file atomically
+            portfolio.replace('timeline', new_data)
             
-            # Save to file
-            with open('static/data/timeline.json', 'w', encoding='utf-8') as f:
-                json.dump(new_data, f, indent=2, ensure_ascii=False)
+            return jsonify({"status": "success", "message": "Timeline updated successfully"})
+        
+        except ValueError as e:
+            return jsonify({"status": "error", "message": f"Validation error: {str(e)}"}), 400
+        except Exception as e:
+            return jsonify({"status": "error", "message": f"Error updating timeline: {str(e)}"}), 500
+    
+    elif request.method == 'PATCH':
+        try:
+            ops = request.get_json()
+            if not ops:
+                return jsonify({"status": "error", "message": "No data provided"}), 400
             
-            # Reload data
-            load_and_validate_data()
+            # Validate only the touched entries and journal the patch
+            portfolio.patch('timeline', ops)
             
             return jsonify({"status": "success", "message": "Timeline updated successfully"})
         
@@ -423,6 +1461,22 @@ def admin_timeline():
         except Exception as e:
             return jsonify({"status": "error", "message": f"Error updating timeline: {str(e)}"}), 500
 
+@app.route('/admin/admission')
+def admission_stats():
+    """Admission control counters per priority class"""
+    with admission.lock:
+        return jsonify({name: dict(stats) for name, stats in admission.stats.items()})
+
+@app.route('/admin/tenants')
+def tenant_stats():
+    """Loaded tenants in multi-tenant mode"""
+    return jsonify(dict(tenants.stats(), mode=MULTI_TENANT or 'single'))
+
+@app.route('/admin/bans')
+def abuse_bans():
+    """Currently active automatic bans"""
+    return jsonify(security.abuse.active_bans())
+
 # ========== GEMINI AI INTEGRATION ==========
 class GeminiProvider:
     """Google Gemini AI integration"""
@@ -463,31 +1517,32 @@ class GeminiProvider:
                 break
         return result.strip()
     
-    def build_portfolio_context(self):
+    def build_portfolio_context(self, portfolio=None):
         """Build context from portfolio data"""
-        context = "# Guu's Portfolio Information\n\n"
+        portfolio = portfolio or current_portfolio()
+        context = f"# {portfolio.profile['name']}'s Portfolio Information\n\n"
         
         # Add projects
-        if projects:
+        if portfolio.projects:
             context += "## Projects\n"
-            for project in projects[:3]:  # Limit to 3 projects
+            for project in portfolio.projects[:3]:  # Limit to 3 projects
                 context += f"### {project['title']}\n"
                 context += f"Description: {project['description']}\n"
                 context += f"Technologies: {', '.join(project['technologies'])}\n\n"
         
         # Add skills
-        if skills:
+        if portfolio.skills:
             context += "## Skills\n"
-            for category in skills[:2]:  # Limit to 2 categories
+            for category in portfolio.skills[:2]:  # Limit to 2 categories
                 context += f"### {category['category']}\n"
                 for skill in category['items'][:3]:  # Limit to 3 skills per category
                     context += f"- {skill['name']}: {skill['proficiency']}/5\n"
                 context += "\n"
         
         # Add timeline
-        if timeline_data:
+        if portfolio.timeline_data:
             context += "## Recent Experience\n"
-            for event in sorted(timeline_data, key=lambda x: x['year'], reverse=True)[:2]:
+            for event in portfolio.timeline_index.newest_first[:2]:
                 context += f"### {event['year']} - {event['title']}\n"
                 context += f"{event['description']}\n\n"
         
@@ -498,21 +1553,23 @@ class GeminiProvider:
         if not self.is_available():
             raise Exception("Gemini API key not configured")
         
-        # Build context if not provided
+        # Build context if not provided (cached per portfolio until its data changes)
         if not context:
-            context = self.build_portfolio_context()
+            portfolio = current_portfolio()
+            context = portfolio.cached('gemini_context', lambda: self.build_portfolio_context(portfolio))
         
         # Truncate context if too long
         context = self.truncate_context(context)
         
-        full_prompt = f"""You are Guu's portfolio assistant. You help visitors learn about Guu's projects, skills, and experience.
+        name = current_portfolio().profile['short_name']
+        full_prompt = f"""You are {name}'s portfolio assistant. You help visitors learn about {name}'s projects, skills, and experience.
 
 IMPORTANT GUIDELINES:
 - Always answer in a friendly, professional tone
 - Base your responses on the provided context data
 - Keep responses concise but informative
 - Use markdown formatting for better readability
-- Always refer to the person as "Guu" in third person
+- Always refer to the person as "{name}" in third person
 
 AVAILABLE CONTEXT DATA:
 {context}
@@ -536,6 +1593,8 @@ RESPONSE:"""
             raise Exception(f"Gemini API error: {str(e)}")
 
 # ========== CHATBOT FUNCTIONALITY ==========
+CONTACT_LABELS = {'github': 'GitHub', 'linkedin': 'LinkedIn', 'twitter': 'Twitter', 'facebook': 'Facebook', 'blog': 'Blog'}
+
 class PortfolioChatbot:
     """Chatbot that answers questions based on portfolio data"""
     
@@ -543,39 +1602,48 @@ class PortfolioChatbot:
         # Initialize Gemini provider
         self.gemini_provider = GeminiProvider()
         self.fallback_enabled = True
+        # Intents always answered from local data, never Gemini; their answers are cacheable
+        self.local_intents = set(filter(None, os.getenv('CHAT_LOCAL_INTENTS', '').split(',')))
+        # {name}, {possessive} and {object} are filled in from the portfolio's profile
         self.responses = {
             'greeting': [
-                "Hello! I'm Guu's portfolio assistant. I can help you learn about his projects, skills, and experience.",
-                "Hi there! I'm here to help you explore Guu's portfolio. What would you like to know?",
-                "Welcome! I can tell you about Guu's projects, skills, timeline, and experience. How can I help?"
+                "Hello! I'm {name}'s portfolio assistant. I can help you learn about {possessive} projects, skills, and experience.",
+                "Hi there! I'm here to help you explore {name}'s portfolio. What would you like to know?",
+                "Welcome! I can tell you about {name}'s projects, skills, timeline, and experience. How can I help?"
             ],
             'projects': [
-                "Let me tell you about Guu's projects...",
-                "Here are the projects Guu has worked on:",
-                "Guu has developed several interesting projects:"
+                "Let me tell you about {name}'s projects...",
+                "Here are the projects {name} has worked on:",
+                "{name} has developed several interesting projects:"
             ],
             'skills': [
-                "Here are Guu's technical skills:",
-                "Guu has expertise in the following areas:",
-                "Let me break down Guu's skills by category:"
+                "Here are {name}'s technical skills:",
+                "{name} has expertise in the following areas:",
+                "Let me break down {name}'s skills by category:"
             ],
             'timeline': [
-                "Here's Guu's professional journey:",
-                "Let me walk you through Guu's career timeline:",
-                "Here's how Guu's career has progressed:"
+                "Here's {name}'s professional journey:",
+                "Let me walk you through {name}'s career timeline:",
+                "Here's how {name}'s career has progressed:"
             ],
             'contact': [
-                "You can reach Guu through these channels:",
-                "Here's how to get in touch with Guu:",
-                "Guu is available on these platforms:"
+                "You can reach {name} through these channels:",
+                "Here's how to get in touch with {name}:",
+                "{name} is available on these platforms:"
             ],
             'default': [
-                "I'm not sure about that. I can help you with information about Guu's projects, skills, timeline, or contact details.",
-                "I can tell you about Guu's projects, skills, experience, or how to contact him. What interests you?",
-                "I specialize in Guu's portfolio information. Ask me about his projects, skills, or professional journey!"
+                "I'm not sure about that. I can help you with information about {name}'s projects, skills, timeline, or contact details.",
+                "I can tell you about {name}'s projects, skills, experience, or how to contact {object}. What interests you?",
+                "I specialize in {name}'s portfolio information. Ask me about {possessive} projects, skills, or professional journey!"
             ]
         }
     
+    def pick_response(self, intent, profile):
+        """Random canned response for intent, addressed to the portfolio's owner"""
+        import random
+        return random.choice(self.responses[intent]).format(
+            name=profile['short_name'], **profile['pronouns'])
+    
     def detect_intent(self, message):
         """Detect user intent from message"""
         message_lower = message.lower()
@@ -633,14 +1701,15 @@ class PortfolioChatbot:
         
         return 'default'
     
-    def build_portfolio_context(self):
+    def build_portfolio_context(self, portfolio=None):
         """Build comprehensive context from portfolio data"""
-        context = "# Guu's Portfolio Information\n\n"
+        portfolio = portfolio or current_portfolio()
+        context = f"# {portfolio.profile['name']}'s Portfolio Information\n\n"
         
         # Add projects context
-        if projects:
+        if portfolio.projects:
             context += "## Projects\n"
-            for project in projects:
+            for project in portfolio.projects:
                 context += f"### {project['title']}\n"
                 context += f"Description: {project['description']}\n"
                 context += f"Technologies: {', '.join(project['technologies'])}\n"
@@ -651,18 +1720,18 @@ class PortfolioChatbot:
                 context += "\n"
         
         # Add skills context
-        if skills:
+        if portfolio.skills:
             context += "## Skills\n"
-            for category in skills:
+            for category in portfolio.skills:
                 context += f"### {category['category']}\n"
                 for skill in category['items']:
                     context += f"- {skill['name']}: {skill['proficiency']}/5 proficiency\n"
                 context += "\n"
         
         # Add timeline context
-        if timeline_data:
+        if portfolio.timeline_data:
             context += "## Career Timeline\n"
-            for event in sorted(timeline_data, key=lambda x: x['year'], reverse=True):
+            for event in portfolio.timeline_index.newest_first:
                 context += f"### {event['year']} - {event['title']}\n"
                 context += f"{event['description']}\n"
                 if event.get('link'):
@@ -671,45 +1740,49 @@ class PortfolioChatbot:
         
         # Add contact information
         context += "## Contact Information\n"
-        context += "- GitHub: https://github.com/yourusername\n"
-        context += "- LinkedIn: https://linkedin.com/in/yourusername\n"
-        context += "- Blog: https://guutran.wordpress.com\n"
-        context += "- Email: Available through social media platforms\n\n"
+        for key, url in portfolio.profile['links'].items():
+            context += f"- {CONTACT_LABELS.get(key, key.capitalize())}: {url}\n"
+        context += f"- Email: {portfolio.profile['email'] or 'Available through social media platforms'}\n\n"
         
         return context
     
-    def generate_response(self, intent, query=None):
+    def generate_response(self, intent, query=None, use_gemini=True):
         """Generate response using Gemini AI with fallback to local"""
-        import random
+        portfolio = current_portfolio()
+        name = portfolio.profile['short_name']
         
-        # Try Gemini AI first if available
-        if self.gemini_provider.is_available() and query:
+        # Try Gemini AI first if available (skipped when shedding load)
+        if use_gemini and intent not in self.local_intents and self.gemini_provider.is_available() and query:
+            started = time.time()
             try:
                 response_text = self.gemini_provider.generate_response(query)
+                admission.observe('chat', time.time() - started)
                 return {
                     'text': response_text,
                     'suggestions': [
                         'Tell me more about a specific project',
-                        'What technologies does Guu use most?',
-                        'How can I contact Guu?',
-                        'What is Guu\'s experience level?'
+                        f"What technologies does {name} use most?",
+                        f"How can I contact {name}?",
+                        f"What is {name}'s experience level?"
                     ]
                 }
             except Exception as e:
+                # A slow failure (e.g. a timeout) is upstream overload too
+                admission.observe('chat', time.time() - started)
                 logging.warning(f"Gemini AI failed, falling back to local: {str(e)}")
         
         # Fallback to local responses
         if intent == 'greeting':
             return {
-                'text': random.choice(self.responses['greeting']),
+                'text': self.pick_response('greeting', portfolio.profile),
                 'suggestions': ['Tell me about projects', 'What skills do you have?', 'Show me your timeline', 'How can I contact you?']
             }
         
         elif intent == 'projects':
-            response_text = random.choice(self.responses['projects'])
+            response_text = self.pick_response('projects', portfolio.profile)
             project_info = []
             
-            for project in projects:
+            for project in portfolio.projects:
                 project_details = f"**{project['title']}**\n{project['description']}\n"
                 project_details += f"Technologies: {', '.join(project['technologies'])}"
                 if project.get('github'):
@@ -725,10 +1798,10 @@ class PortfolioChatbot:
             }
         
         elif intent == 'skills':
-            response_text = random.choice(self.responses['skills'])
+            response_text = self.pick_response('skills', portfolio.profile)
             skill_info = []
             
-            for category in skills:
+            for category in portfolio.skills:
                 category_text = f"**{category['category']}:**\n"
                 for skill in category['items']:
                     proficiency_stars = '⭐' * skill['proficiency']
@@ -742,10 +1815,10 @@ class PortfolioChatbot:
             }
         
         elif intent == 'timeline':
-            response_text = random.choice(self.responses['timeline'])
+            response_text = self.pick_response('timeline', portfolio.profile)
             timeline_info = []
             
-            for event in sorted(timeline_data, key=lambda x: x['year'], reverse=True):
+            for event in portfolio.timeline_index.newest_first:
                 event_text = f"**{event['year']}** - {event['title']}\n{event['description']}"
                 if event.get('link'):
                     event_text += f"\n[Learn more]({event['link']})"
@@ -759,29 +1832,34 @@ class PortfolioChatbot:
         
         elif intent == 'contact':
             contact_info = [
-                "**GitHub:** [github.com/yourusername](https://github.com/yourusername)",
-                "**LinkedIn:** [linkedin.com/in/yourusername](https://linkedin.com/in/yourusername)",
-                "**Email:** Contact through social media",
-                "**Blog:** [guutran.wordpress.com](https://guutran.wordpress.com)"
+                f"**{CONTACT_LABELS.get(key, key.capitalize())}:** [{url.split('://', 1)[-1]}]({url})"
+                for key, url in portfolio.profile['links'].items()
             ]
+            email = portfolio.profile['email']
+            contact_info.append(f"**Email:** [{email}](mailto:{email})" if email else "**Email:** Contact through social media")
             
             return {
-                'text': random.choice(self.responses['contact']),
+                'text': self.pick_response('contact', portfolio.profile),
                 'data': contact_info,
                 'suggestions': ['Tell me about projects', 'What are your skills?', 'Show me your timeline']
             }
         
         else:
             return {
-                'text': random.choice(self.responses['default']),
+                'text': self.pick_response('default', portfolio.profile),
                 'suggestions': ['Show me projects', 'What skills do you have?', 'Tell me about your experience', 'How can I contact you?']
             }
 
 # Initialize chatbot
 chatbot = PortfolioChatbot()
 
+# How long cacheable chat answers stay fresh, then usable while revalidating (seconds)
+CHAT_CACHE_MAX_AGE = int(os.getenv('CHAT_CACHE_MAX_AGE', 3600))
+CHAT_CACHE_STALE = int(os.getenv('CHAT_CACHE_STALE', 86400))
+
 @app.route('/api/chat', methods=['POST'])
 @security.rate_limit(max_requests=10, window=60)
+@admission.admit('chat')
 def chat():
     """Handle chatbot messages with security"""
     try:
@@ -800,34 +1878,199 @@ def chat():
         
         # Detect intent and generate response
         intent = chatbot.detect_intent(user_message)
-        response = chatbot.generate_response(intent, user_message)
+        response = chatbot.generate_response(intent, user_message, use_gemini=not g.get('degraded'))
         
         # Log successful response
         logging.info(f"Chatbot response sent - Intent: {intent}, IP: {request.remote_addr}")
         
-        return jsonify({
+        result = jsonify({
             'response': response,
             'timestamp': datetime.now().isoformat(),
             'intent': intent
         })
+        
+        # Local answers only depend on the intent and the data version, so the
+        # service worker may cache them; Gemini and degraded answers must not be
+        local = intent in chatbot.local_intents or not chatbot.gemini_provider.is_available()
+        if local and not g.get('degraded'):
+            result.cache_control.private = True
+            result.cache_control.max_age = CHAT_CACHE_MAX_AGE
+            result.cache_control.stale_while_revalidate = CHAT_CACHE_STALE
+        else:
+            result.cache_control.no_store = True
+        return result
     
     except Exception as e:
         logging.error(f"Chatbot error: {str(e)}")
         return jsonify({'error': 'I apologize, but I encountered an error. Please try again.'}), 500
 
+CHAT_SUGGESTIONS = [
+    "Tell me about your projects",
+    "What skills do you have?",
+    "Show me your timeline",
+    "How can I contact you?",
+    "What technologies do you use?",
+    "Tell me about your experience"
+]
+
 @app.route('/api/chat/suggestions')
 def chat_suggestions():
     """Get chat suggestions"""
-    suggestions = [
-        "Tell me about your projects",
-        "What skills do you have?",
-        "Show me your timeline",
-        "How can I contact you?",
-        "What technologies do you use?",
-        "Tell me about your experience"
+    return json_cache.response('chat:suggestions', 0, lambda: {'suggestions': CHAT_SUGGESTIONS})
+
+
+# ========== STATIC EXPORT ==========
+COMPRESSIBLE_TYPES = ('.html', '.css', '.js', '.json', '.svg', '.txt', '.map', '.xml')
+
+def frozen_pages(portfolio):
+    """Page URLs to export, with the datasets each one renders.
+
+    Per-project pages belong here (one URL per entry in portfolio.projects)
+    once project_detail renders HTML.
+    """
+    return [
+        ('/', ('skills', 'profile')),
+        ('/timeline', ('timeline', 'profile')),
+        ('/projects', ('projects', 'profile')),
+        ('/skills', ('skills', 'profile')),
+        ('/sw.js', ()),
     ]
-    return jsonify({'suggestions': suggestions})
 
+def tree_hash(directory):
+    """Hash of every file under directory, used to notice template changes"""
+    digest = hashlib.sha256()
+    for root, dirs, files in sorted(os.walk(directory)):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, directory).encode('utf-8'))
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+def write_output(output, relative_path, body):
+    """Write an exported file plus a .gz variant for compressible types; returns its manifest entry"""
+    path = os.path.join(output, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(body)
+    
+    entry = {'sha256': hashlib.sha256(body).hexdigest(), 'size': len(body), 'gzip': False}
+    if relative_path.endswith(COMPRESSIBLE_TYPES) and len(body) >= 1024:
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(body, 9, mtime=0))
+        entry['gzip'] = True
+    elif os.path.exists(path + '.gz'):
+        os.remove(path + '.gz')
+    return entry
+
+def remove_output(output, relative_path):
+    for path in (os.path.join(output, relative_path), os.path.join(output, relative_path) + '.gz'):
+        if os.path.exists(path):
+            os.remove(path)
+
+def freeze_site(output, force=False):
+    """Export pages, error pages and static files to output.
+
+    manifest.json records a fingerprint of each page's inputs (templates
+    plus the datasets it renders) and the size/mtime of each static file,
+    so later runs only rewrite what changed. Returns counts for reporting.
+    """
+    if MULTI_TENANT:
+        raise ValueError("Static export only covers the single-portfolio site; unset MULTI_TENANT")
+    
+    manifest_path = os.path.join(output, 'manifest.json')
+    previous = {'pages': {}, 'static': {}}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    # --force still needs the old manifest to clean up files that are gone
+    reusable = {'pages': {}, 'static': {}} if force else previous
+    
+    portfolio = default_portfolio
+    # Exported static/data/*.json must include patches still sitting in journals
+    portfolio.compact()
+    templates_hash = tree_hash(app.template_folder)
+    manifest = {'data_version': portfolio.fingerprint(), 'pages': {}, 'static': {}}
+    counts = {'rendered': 0, 'unchanged': 0, 'static_copied': 0, 'removed': 0}
+    
+    error_pages = [(404, page_not_found), (500, internal_server_error), (403, forbidden), (400, bad_request)]
+    handlers = {f'/{code}.html': handler for code, handler in error_pages}
+    pages = frozen_pages(portfolio) + [(url, ('profile',)) for url in handlers]
+    
+    # Pages embed fingerprinted asset URLs, so asset changes re-render them too
+    with app.test_request_context('/'):
+        assets_hash = hashlib.sha256('\n'.join(shell_urls()).encode()).hexdigest()
+    
+    client = app.test_client()
+    for url, datasets in pages:
+        if url == '/':
+            relative_path = 'index.html'
+        elif '.' in url.rsplit('/', 1)[-1]:
+            relative_path = url.lstrip('/')
+        else:
+            relative_path = url.strip('/') + '/index.html'
+        inputs = templates_hash + assets_hash + (portfolio.fingerprint(*datasets) if datasets else '')
+        fingerprint = hashlib.sha256(inputs.encode()).hexdigest()
+        old = reusable['pages'].get(url)
+        if old and old.get('fingerprint') == fingerprint and os.path.exists(os.path.join(output, relative_path)):
+            manifest['pages'][url] = old
+            counts['unchanged'] += 1
+            continue
+        
+        if url in handlers:
+            with app.test_request_context('/'):
+                code = int(url[1:4])
+                body = handlers[url](default_exceptions[code]())[0].encode('utf-8')
+        else:
+            response = client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f"Rendering {url} returned {response.status_code}")
+            body = response.data
+        
+        entry = write_output(output, relative_path, body)
+        manifest['pages'][url] = dict(entry, file=relative_path, fingerprint=fingerprint)
+        counts['rendered'] += 1
+    
+    for root, dirs, files in os.walk(app.static_folder):
+        for name in files:
+            if name.endswith('.journal') or name.startswith('.tmp-'):
+                continue
+            source = os.path.join(root, name)
+            relative_path = os.path.join('static', os.path.relpath(source, app.static_folder)).replace(os.sep, '/')
+            stat = os.stat(source)
+            old = reusable['static'].get(relative_path)
+            if old and old['size'] == stat.st_size and old['mtime'] == stat.st_mtime \
+                    and os.path.exists(os.path.join(output, relative_path)):
+                manifest['static'][relative_path] = old
+                continue
+            with open(source, 'rb') as f:
+                entry = write_output(output, relative_path, f.read())
+            manifest['static'][relative_path] = dict(entry, mtime=stat.st_mtime)
+            counts['static_copied'] += 1
+    
+    # Drop files whose page or asset no longer exists
+    for section in ('pages', 'static'):
+        for key, entry in previous[section].items():
+            if key not in manifest[section]:
+                remove_output(output, entry.get('file', key))
+                counts['removed'] += 1
+    
+    write_output(output, 'manifest.json', json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return counts
+
+@app.cli.command('freeze')
+@click.option('--output', default='build', show_default=True, help="Directory to export into")
+@click.option('--force', is_flag=True, help="Re-render everything instead of reusing unchanged files")
+def freeze_command(output, force):
+    """Pre-render every page for serving from a CDN or plain file server."""
+    try:
+        counts = freeze_site(output, force)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Rendered {counts['rendered']} pages ({counts['unchanged']} unchanged), "
+               f"copied {counts['static_copied']} static files, removed {counts['removed']} stale files "
+               f"into {output}/")
 
 
 if __name__ == '__main__':
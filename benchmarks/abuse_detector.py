@@ -0,0 +1,83 @@
+"""Simulate millions of source addresses against AbuseDetector.
+
+Usage: python benchmarks/abuse_detector.py [--sources 2000000] [--attackers 50]
+
+Legitimate clients send a handful of requests each, a few attackers flood
+from single IPs and one /24 is used for a distributed flood. Reports
+throughput, detector memory (which stays flat as sources grow), and how
+many attackers vs legitimate clients ended up banned.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import AbuseDetector  # noqa: E402
+
+
+def random_ip(rng):
+    return f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+
+
+def detector_bytes(detector):
+    sketches = sum(row.buffer_info()[1] * row.itemsize
+                   for sketch in (detector.current, detector.previous) for row in sketch.rows)
+    return sketches + sys.getsizeof(detector.bans) + 100 * len(detector.bans)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sources', type=int, default=2_000_000)
+    parser.add_argument('--attackers', type=int, default=50)
+    parser.add_argument('--rate', type=int, default=2000, help="new sources per second")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    attackers = [random_ip(rng) for _ in range(args.attackers)]
+    flood_subnet = '10.66.6'
+
+    detector = AbuseDetector()
+    now = time.time()
+    step = 1 / args.rate
+    legit_ips = []
+    events = 0
+    started = time.perf_counter()
+    for n in range(args.sources):
+        now += step
+        ip = random_ip(rng)
+        if n % 1000 == 0:
+            legit_ips.append(ip)
+        for _ in range(rng.randint(1, 3)):
+            detector.record(ip, now=now)
+            events += 1
+        # Attackers and the distributed flood interleave with normal traffic
+        if n % 10 == 0:
+            attacker = attackers[n // 10 % len(attackers)]
+            if not detector.is_banned(attacker, now):
+                detector.record(attacker, now=now)
+                events += 1
+        if n % 20 == 0:
+            flood_ip = f"{flood_subnet}.{rng.randint(1, 254)}"
+            if not detector.is_banned(flood_ip, now):
+                detector.record(flood_ip, now=now)
+                events += 1
+        if n and n % 500_000 == 0:
+            print(f"{n:>10,} sources  detector memory {detector_bytes(detector) / 1e6:6.2f} MB")
+    elapsed = time.perf_counter() - started
+
+    banned_attackers = sum(detector.is_banned(ip, now) or ip in detector.bans for ip in attackers)
+    banned_legit = sum(ip in detector.bans for ip in legit_ips)
+    print(f"{args.sources:,} sources, {events:,} events in {elapsed:.1f}s "
+          f"({events / elapsed:,.0f} events/s)")
+    print(f"detector memory {detector_bytes(detector) / 1e6:.2f} MB, {len(detector.bans)} ban entries")
+    print(f"attackers banned: {banned_attackers}/{len(attackers)}")
+    print(f"flood subnet banned: {f'{flood_subnet}.0/24' in detector.bans}")
+    print(f"legitimate clients banned (sampled): {banned_legit}/{len(legit_ips)}")
+
+
+if __name__ == '__main__':
+    main()
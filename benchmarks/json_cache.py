@@ -0,0 +1,78 @@
+"""Serialization cost of read-heavy JSON endpoints, cached vs plain jsonify.
+
+Usage: python benchmarks/json_cache.py [--projects 2000] [--requests 2000]
+
+Loads a large synthetic project catalogue, then times GET /admin/data/projects
+through JSONResponseCache against calling jsonify on the same data, and shows
+the conditional (If-None-Match) path that sync jobs hit when nothing changed.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as portfolio  # noqa: E402
+
+
+def timed(label, fn, requests):
+    started = time.process_time()
+    for _ in range(requests):
+        fn()
+    per_request = (time.process_time() - started) / requests * 1e6
+    print(f"{label:<40} {per_request:10.1f} µs CPU/request")
+    return per_request
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    data = portfolio.default_portfolio
+    data.set('projects', [
+        {
+            'title': f"Project {i}",
+            'description': "Ứng dụng phân loại hình ảnh sử dụng CNN. " * 4,
+            'technologies': ['Python', 'TensorFlow', 'OpenCV', 'Flask'],
+            'github': f"https://github.com/example/project-{i}",
+            'demo': '',
+        }
+        for i in range(args.projects)
+    ])
+    version = data.versions['projects']
+    cache = data.json_cache
+    print(f"orjson provider: {'yes' if portfolio.orjson else 'no (stdlib json)'}, "
+          f"{args.projects} projects")
+
+    app = portfolio.app
+    with app.test_request_context('/admin/data/projects'):
+        body = cache.get('admin:projects', version, lambda: data.projects)['body']
+        print(f"body {len(body) / 1024:.0f} KiB")
+
+        plain = timed("jsonify every request",
+                      lambda: portfolio.jsonify(data.projects), args.requests)
+        cached = timed("cached body, unchanged data",
+                       lambda: cache.response('admin:projects', version, lambda: data.projects),
+                       args.requests)
+
+    with app.test_request_context('/admin/data/projects', headers={'Accept-Encoding': 'gzip'}):
+        timed("cached gzip body, unchanged data",
+              lambda: cache.response('admin:projects', version, lambda: data.projects),
+              args.requests)
+
+    etag = cache.get('admin:projects', version, lambda: data.projects)['etag']
+    with app.test_request_context('/admin/data/projects', headers={'If-None-Match': f'"{etag}"'}):
+        response = cache.response('admin:projects', version, lambda: data.projects)
+        assert response.status_code == 304
+        timed("conditional request (304)",
+              lambda: cache.response('admin:projects', version, lambda: data.projects),
+              args.requests)
+
+    print(f"speedup on unchanged data: {plain / cached:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
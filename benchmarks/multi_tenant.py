@@ -0,0 +1,64 @@
+"""Serve thousands of tenant portfolios from one process with a capped LRU.
+
+Usage: python benchmarks/multi_tenant.py [--tenants 5000] [--requests 20000] [--cache 500]
+
+Creates tenant data directories in a temp dir (copies of static/data), runs
+path-prefixed requests against random tenants with a skewed popularity, and
+reports hit rate, latency and how many tenants stay resident.
+"""
+import argparse
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tenants', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--cache', type=int, default=500, help="TENANT_CACHE_MAX")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    tenants_dir = tempfile.mkdtemp(prefix='tenants-')
+    try:
+        for i in range(args.tenants):
+            shutil.copytree(os.path.join(ROOT, 'static', 'data'), os.path.join(tenants_dir, f"tenant-{i}"))
+
+        os.environ.update(MULTI_TENANT='path', TENANTS_DIR=tenants_dir, TENANT_CACHE_MAX=str(args.cache))
+        os.chdir(ROOT)
+        sys.path.insert(0, ROOT)
+        import app as portfolio
+
+        client = portfolio.app.test_client()
+        rng = random.Random(args.seed)
+        loads = 0
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            # Zipf-like popularity: a few tenants get most of the traffic
+            tenant = f"tenant-{min(int(rng.paretovariate(0.5)) - 1, args.tenants - 1)}"
+            if tenant not in portfolio.tenants.tenants:
+                loads += 1
+            response = client.get(f"/{tenant}/timeline")
+            assert response.status_code == 200
+        elapsed = time.perf_counter() - started
+
+        stats = portfolio.tenants.stats()
+        print(f"{args.tenants} tenants, {args.requests} requests in {elapsed:.1f}s "
+              f"({elapsed / args.requests * 1e3:.2f} ms/request)")
+        print(f"cold loads {loads} ({(1 - loads / args.requests) * 100:.1f}% hit rate)")
+        print(f"resident tenants {stats['loaded']} (cap {stats['max_tenants']}), "
+              f"{stats['total_bytes'] / 1e6:.2f} MB of tenant JSON")
+        print(f"process max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+    finally:
+        shutil.rmtree(tenants_dir)
+
+
+if __name__ == '__main__':
+    main()
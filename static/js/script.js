@@ -6,9 +6,7 @@ function initializeTerminal() {
     // Dữ liệu để hiển thị
     const data = [
         { key: "skills", value: "" },
-        { key: "job", value: "Intern AI Engineer at Opus Solution" },
-        { key: "hobbies", value: "exploring AI, open-source, reading, audiobook story, and learning new things" },
-        { key: "project", value: "real-time image processing, speech recognition, and chatbot" },
+        ...(typeof profileFacts !== "undefined" ? profileFacts : []),
     ];
 
     // Thêm skills từ skillsData nếu tồn tại
@@ -124,6 +122,7 @@ class PortfolioChatbot {
     }
 
     createChatbotHTML() {
+        const config = window.chatbotConfig || {};
         const chatbotHTML = `
             <div class="chatbot-container">
                 <button class="chatbot-toggle" id="chatbot-toggle">
@@ -135,13 +134,14 @@ class PortfolioChatbot {
                     </div>
                     <div class="chatbot-messages" id="chatbot-messages"></div>
                     <div class="chatbot-input">
-                        <input type="text" id="chatbot-input" placeholder="Ask me about Guu's portfolio..." maxlength="500">
+                        <input type="text" id="chatbot-input" maxlength="500">
                         <button id="chatbot-send">Send</button>
                     </div>
                 </div>
             </div>
         `;
         document.body.insertAdjacentHTML('beforeend', chatbotHTML);
+        document.getElementById('chatbot-input').placeholder = config.placeholderText || "Ask me about this portfolio...";
     }
 
     bindEvents() {
@@ -179,7 +179,7 @@ class PortfolioChatbot {
     addWelcomeMessage() {
         const welcomeMessage = {
             type: 'bot',
-            text: "Hello! I'm Guu's portfolio assistant. I can help you learn about his projects, skills, and experience. What would you like to know?",
+            text: (window.chatbotConfig || {}).welcomeMessage || "Hello! I'm the portfolio assistant. What would you like to know?",
             suggestions: ['Tell me about projects', 'What skills do you have?', 'Show me your timeline', 'How can I contact you?']
         };
         this.addMessage(welcomeMessage);
@@ -201,7 +201,8 @@ class PortfolioChatbot {
         this.showTypingIndicator();
 
         try {
-            const response = await fetch('/api/chat', {
+            // data-root carries the tenant prefix when the site is served under one
+            const response = await fetch(`${document.body.dataset.root || ''}/api/chat`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -314,6 +315,15 @@ class PortfolioChatbot {
     }
 }
 
+// Đăng ký service worker (cache trang và câu trả lời chatbot)
+function registerServiceWorker() {
+    if (!('serviceWorker' in navigator)) return;
+    const root = document.body.dataset.root || '';
+    navigator.serviceWorker.register(`${root}/sw.js`).catch((error) => {
+        console.warn('Service worker registration failed:', error);
+    });
+}
+
 // Initialize chatbot
 let chatbot;
 
@@ -322,4 +332,5 @@ document.addEventListener("DOMContentLoaded", function () {
     initializeTerminal(); // Khởi tạo terminal (chỉ chạy trên trang Home)
     initializeTopUpButton(); // Khởi tạo nút Top-Up (chạy trên mọi trang)
     chatbot = new PortfolioChatbot(); // Khởi tạo chatbot
+    registerServiceWorker(); // Đăng ký service worker
 });
\ No newline at end of file
@@ -0,0 +1,175 @@
+// Service worker: precached app shell, stale-while-revalidate pages and
+// cached local chatbot answers keyed by the server's data version.
+const SHELL_CACHE = 'shell-{{ shell_version }}';
+const PAGE_CACHE = 'pages';
+const CHAT_CACHE = 'chat';
+const META_CACHE = 'meta';
+const SHELL_URLS = {{ shell_urls | tojson }};
+const PAGE_URLS = {{ page_urls | tojson }};
+const SCOPE = new URL(self.registration.scope).pathname;
+const VERSION_KEY = `${SCOPE}__data-version`;
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(
+        caches.open(SHELL_CACHE)
+            .then((cache) => cache.addAll(SHELL_URLS))
+            .then(precachePages)
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', (event) => {
+    // Drop shell caches from previous asset versions
+    event.waitUntil(
+        caches.keys()
+            .then((keys) => Promise.all(
+                keys.filter((key) => key.startsWith('shell-') && key !== SHELL_CACHE)
+                    .map((key) => caches.delete(key))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+
+    if (request.method === 'POST' && url.pathname === `${SCOPE}api/chat`) {
+        event.respondWith(chatResponse(event));
+    } else if (request.method !== 'GET' || url.pathname.startsWith(`${SCOPE}admin/`)
+               || url.pathname.startsWith(`${SCOPE}api/`)) {
+        return;
+    } else if (url.pathname.startsWith(`${SCOPE}static/`) && url.searchParams.has('v')) {
+        // Fingerprinted assets never change under the same URL
+        event.respondWith(caches.match(request).then((cached) => cached || fetchAndCache(request, SHELL_CACHE)));
+    } else if (request.mode === 'navigate') {
+        event.respondWith(staleWhileRevalidate(event, request));
+    }
+});
+
+async function fetchAndCache(request, cacheName) {
+    const response = await fetch(request);
+    if (response.ok) {
+        const cache = await caches.open(cacheName);
+        await cache.put(request, response.clone());
+    }
+    return response;
+}
+
+// Pages go in PAGE_CACHE, not the shell cache, so a data version change
+// drops every copy of them
+async function precachePages() {
+    for (const url of PAGE_URLS) {
+        const response = await fetch(url);
+        if (!response.ok) throw new Error(`Precaching ${url} failed: ${response.status}`);
+        await checkDataVersion(response);
+        await (await caches.open(PAGE_CACHE)).put(url, storable(response));
+    }
+}
+
+// A redirected response can't answer a navigation, and static exports on
+// plain file servers redirect /timeline to /timeline/, so keep a copy
+// without the redirect flag instead
+function storable(response) {
+    if (!response.redirected) return response;
+    return new Response(response.body, {
+        status: response.status,
+        statusText: response.statusText,
+        headers: response.headers,
+    });
+}
+
+async function staleWhileRevalidate(event, request) {
+    const cached = await (await caches.open(PAGE_CACHE)).match(request);
+    const network = fetch(request).then(async (response) => {
+        if (response.ok) {
+            await checkDataVersion(response);
+            const cache = await caches.open(PAGE_CACHE);
+            await cache.put(request, storable(response.clone()));
+        }
+        return storable(response);
+    });
+    if (cached) {
+        event.waitUntil(network.catch(() => {}));
+        return cached;
+    }
+    return network;
+}
+
+// Pages and chat answers carry X-Data-Version; when it moves, cached
+// pages and chat answers built from the old data are dropped.
+async function checkDataVersion(response) {
+    const version = response.headers.get('X-Data-Version');
+    if (!version) return;
+    const meta = await caches.open(META_CACHE);
+    const stored = await meta.match(VERSION_KEY);
+    if (stored && await stored.text() === version) return;
+    await Promise.all([caches.delete(CHAT_CACHE), caches.delete(PAGE_CACHE)]);
+    await meta.put(VERSION_KEY, new Response(version));
+}
+
+async function currentDataVersion() {
+    const stored = await (await caches.open(META_CACHE)).match(VERSION_KEY);
+    return stored ? stored.text() : null;
+}
+
+function cacheLifetimes(response) {
+    const header = response.headers.get('Cache-Control') || '';
+    if (/no-store/.test(header)) return null;
+    const maxAge = /max-age=(\d+)/.exec(header);
+    const stale = /stale-while-revalidate=(\d+)/.exec(header);
+    if (!maxAge) return null;
+    return { maxAge: Number(maxAge[1]), stale: stale ? Number(stale[1]) : 0 };
+}
+
+async function chatResponse(event) {
+    const request = event.request;
+    let message;
+    try {
+        message = (await request.clone().json()).message;
+    } catch (error) {
+        return fetch(request);
+    }
+    if (typeof message !== 'string') return fetch(request);
+
+    const version = await currentDataVersion();
+    const normalized = message.trim().toLowerCase().replace(/\s+/g, ' ');
+    const key = version ? `${SCOPE}__chat/${version}/${encodeURIComponent(normalized)}` : null;
+    const cache = await caches.open(CHAT_CACHE);
+    const cached = key ? await cache.match(key) : null;
+
+    const revalidate = () => fetch(request.clone()).then(async (response) => {
+        await checkDataVersion(response);
+        const lifetimes = cacheLifetimes(response);
+        const freshVersion = response.headers.get('X-Data-Version');
+        if (response.ok && lifetimes && freshVersion) {
+            const headers = new Headers(response.headers);
+            headers.set('X-Cached-At', String(Date.now()));
+            const body = await response.clone().arrayBuffer();
+            const chatCache = await caches.open(CHAT_CACHE);
+            await chatCache.put(`${SCOPE}__chat/${freshVersion}/${encodeURIComponent(normalized)}`,
+                                new Response(body, { status: response.status, headers }));
+        }
+        return response;
+    });
+
+    if (cached) {
+        const lifetimes = cacheLifetimes(cached);
+        const age = (Date.now() - Number(cached.headers.get('X-Cached-At') || 0)) / 1000;
+        if (lifetimes && age < lifetimes.maxAge) {
+            return cached;
+        }
+        if (lifetimes && age < lifetimes.maxAge + lifetimes.stale) {
+            event.waitUntil(revalidate().catch(() => {}));
+            return cached;
+        }
+    }
+    try {
+        return await revalidate();
+    } catch (error) {
+        // Offline: an expired answer beats no answer
+        if (cached) return cached;
+        throw error;
+    }
+}